@@ -126,6 +126,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache (file-based so Telegram file_ids survive bot restarts)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -135,11 +143,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_ADMIN_USERNAME = 'yomasupplier'  # Admin username without @
 TELEGRAM_ADMIN_CHAT_ID = os.getenv('TELEGRAM_ADMIN_CHAT_ID', '')  # Admin's chat ID
+# Public base URL for webhook mode (e.g. https://bot.example.com);
+# leave empty to use long polling
+TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')
 
 # Google Sheets Configuration
 GOOGLE_SHEETS_CREDENTIALS_FILE = BASE_DIR / 'google-credentials.json'
 GOOGLE_SHEETS_SPREADSHEET_ID = '1q5_MLhoFUjKx0v7wlqM8gGT21WGurWPb1I3pqf7T5cE'
 GOOGLE_SHEETS_WORKSHEET_NAME = 'Inventory'
+# How long fetched product data is served from memory before the next
+# call re-reads the sheet
+SHEETS_CACHE_TTL = int(os.getenv('SHEETS_CACHE_TTL', '300'))
+# Shared secret for the /sheets-webhook/ change-notification endpoint
+# (sent as the X-Webhook-Token header); empty disables the check
+SHEETS_WEBHOOK_TOKEN = os.getenv('SHEETS_WEBHOOK_TOKEN', '')
 
 # Logging Configuration
 # Ensure logs directory exists
@@ -6,8 +6,11 @@ from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from products.views import sheets_webhook
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('sheets-webhook/', sheets_webhook),
 ]
 
 # Serve media files during development
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, UserProfile
+from .models import OrderMessage, Product, UserProfile
 
 
 @admin.register(UserProfile)
@@ -46,3 +46,14 @@ class ProductAdmin(admin.ModelAdmin):
             'fields': ('expiry_date', 'created_at')
         }),
     )
+
+
+@admin.register(OrderMessage)
+class OrderMessageAdmin(admin.ModelAdmin):
+    """
+    Admin interface for OrderMessage model.
+    """
+    list_display = ('message_id', 'customer_id', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('message_id', 'customer_id')
+    readonly_fields = ('message_id', 'customer_id', 'created_at')
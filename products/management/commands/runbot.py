@@ -1,16 +1,17 @@
-import os
 import logging
+import time
 import aiohttp
 import asyncio
-import tempfile
-from urllib.parse import quote
+from collections import OrderedDict
+from urllib.parse import quote, urlsplit
 from datetime import datetime
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.core.cache import cache as django_cache
 from asgiref.sync import sync_to_async
-from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
-from telegram.constants import ParseMode
+from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
+from telegram.ext import AIORateLimiter, Application, CommandHandler, Defaults, MessageHandler, filters, ContextTypes, CallbackQueryHandler
+from telegram.constants import ChatAction, ParseMode
 from products.sheets_service import sheets_service
 
 # Configure logging
@@ -20,10 +21,226 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# In-process image caches shared by all users.
+# FILE_ID_CACHE maps image URL -> Telegram file_id, so once a photo has been
+# uploaded we can re-send it without transferring any bytes at all.
+# IMAGE_CACHE maps image URL -> raw bytes (bounded LRU) to avoid re-downloading
+# the same image before a file_id is known.
+IMAGE_CACHE_MAX_SIZE = 128
+IMAGE_CACHE = OrderedDict()
+FILE_ID_CACHE = {}
+
+# Single aiohttp session shared by all image downloads.
+# Reusing one session keeps connections alive and caches DNS lookups,
+# instead of paying a TCP+TLS handshake for every image.
+HTTP_SESSION = None
+_HTTP_SESSION_LOCK = asyncio.Lock()
+
+
+async def _get_http_session():
+    """Get (lazily creating) the shared aiohttp session."""
+    global HTTP_SESSION
+    if HTTP_SESSION is None or HTTP_SESSION.closed:
+        async with _HTTP_SESSION_LOCK:
+            if HTTP_SESSION is None or HTTP_SESSION.closed:
+                # Split timeouts fail fast on a degraded image host
+                # instead of stalling sends for the full total
+                HTTP_SESSION = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=32,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=60
+                    ),
+                    timeout=aiohttp.ClientTimeout(
+                        total=8,
+                        connect=2,
+                        sock_connect=2,
+                        sock_read=3
+                    )
+                )
+    return HTTP_SESSION
+
+
+async def _close_http_session(application):
+    """Close the shared aiohttp session on bot shutdown."""
+    if HTTP_SESSION is not None and not HTTP_SESSION.closed:
+        await HTTP_SESSION.close()
+
+
+# Per-host circuit breaker for image downloads: after a few consecutive
+# failures a host is skipped entirely for a cooldown period, so a dying
+# CDN bounds tail latency instead of stalling every send
+HOST_FAIL_THRESHOLD = 3
+HOST_COOLDOWN_SECONDS = 60
+_HOST_FAILURES = {}
+
+
+def _host_is_bad(image_url):
+    """Check whether the URL's host is in its failure cooldown window."""
+    host = urlsplit(image_url).netloc
+    _, bad_until = _HOST_FAILURES.get(host, (0, 0.0))
+    return bad_until > time.monotonic()
+
+
+def _record_host_result(image_url, ok):
+    """Track consecutive failures per host, opening the breaker at the threshold."""
+    host = urlsplit(image_url).netloc
+    if ok:
+        _HOST_FAILURES.pop(host, None)
+        return
+    failures, _ = _HOST_FAILURES.get(host, (0, 0.0))
+    failures += 1
+    bad_until = time.monotonic() + HOST_COOLDOWN_SECONDS if failures >= HOST_FAIL_THRESHOLD else 0.0
+    _HOST_FAILURES[host] = (failures, bad_until)
+
+
+async def _download_image(image_url):
+    """
+    Download image bytes through the shared session and cache them.
+
+    Returns None (without retrying) when the host is in its circuit-
+    breaker cooldown or the download fails.
+    """
+    if _host_is_bad(image_url):
+        logger.debug("Skipping download, host in cooldown: %s", image_url)
+        return None
+    try:
+        session = await _get_http_session()
+        async with session.get(image_url) as response:
+            if response.status == 200:
+                image_data = await response.read()
+                _cache_image(image_url, image_data)
+                _record_host_result(image_url, ok=True)
+                return image_data
+            _record_host_result(image_url, ok=False)
+    except Exception as e:
+        logger.warning("Error downloading image: %s", e)
+        _record_host_result(image_url, ok=False)
+    return None
+
+
+async def _warm_image_cache():
+    """
+    Prefetch all cached products' images into the byte cache.
+
+    Runs in the background after a sheet refresh so the first user to
+    press a category button doesn't pay the download latency.
+    """
+    products = []
+    for status in ('In-Stock', 'On The Way'):
+        cached = sheets_service.get_cached_products(status)
+        if cached:
+            products.extend(cached)
+
+    # Skip images we can already serve from cache or by file_id
+    urls = [
+        p.image_link for p in products
+        if p.image_link
+        and p.image_link not in IMAGE_CACHE
+        and p.image_link not in FILE_ID_CACHE
+    ]
+    if not urls:
+        return
+
+    semaphore = asyncio.Semaphore(16)
+
+    async def fetch(url):
+        async with semaphore:
+            await _download_image(url)
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+    logger.info("Warmed image cache with %d image(s)", len(urls))
+
+
+async def _refresh_and_warm():
+    """Revalidate the sheet cache if still stale, then prefetch images.
+
+    Goes through the TTL + refresh-lock read path rather than the
+    unconditional refresh, so a burst of taps during the stale window
+    collapses to a single sheet fetch; the admin's explicit /refresh is
+    the only caller that forces one.
+    """
+    await sync_to_async(sheets_service.get_all_statuses, thread_sensitive=False)()
+    await _warm_image_cache()
+
+
+# Telegram allows at most 10 photos per sendMediaGroup call
+MEDIA_GROUP_SIZE = 10
+
+
+async def _get_image_media(product):
+    """
+    Get something reply-able for a product's image: a cached Telegram
+    file_id, cached bytes, or freshly downloaded bytes. Returns None if
+    the product has no usable image.
+    """
+    image_url = product.image_link
+    if not image_url:
+        return None
+
+    file_id = await _get_file_id(image_url)
+    if file_id:
+        return file_id
+
+    image_data = _get_cached_image(image_url)
+    if image_data is None:
+        image_data = await _download_image(image_url)
+    return image_data
+
+
+def _get_cached_image(image_url):
+    """Get cached image bytes for a URL, refreshing its LRU position."""
+    image_data = IMAGE_CACHE.get(image_url)
+    if image_data is not None:
+        IMAGE_CACHE.move_to_end(image_url)
+    return image_data
+
+
+def _cache_image(image_url, image_data):
+    """Store image bytes in the LRU cache, evicting the oldest entries."""
+    IMAGE_CACHE[image_url] = image_data
+    IMAGE_CACHE.move_to_end(image_url)
+    while len(IMAGE_CACHE) > IMAGE_CACHE_MAX_SIZE:
+        IMAGE_CACHE.popitem(last=False)
+
+
+# file_ids are also persisted through Django's cache so a bot restart
+# doesn't force re-uploading the whole catalog
+FILE_ID_CACHE_KEY_PREFIX = 'telegram_file_id:'
+
+
+async def _get_file_id(image_url):
+    """Look up a Telegram file_id for a URL (memory first, then Django cache)."""
+    file_id = FILE_ID_CACHE.get(image_url)
+    if file_id is None:
+        file_id = await sync_to_async(django_cache.get, thread_sensitive=False)(FILE_ID_CACHE_KEY_PREFIX + image_url)
+        if file_id:
+            FILE_ID_CACHE[image_url] = file_id
+    return file_id
+
+
+async def _store_file_id(image_url, file_id):
+    """Remember a Telegram file_id in memory and in Django's cache."""
+    FILE_ID_CACHE[image_url] = file_id
+    await sync_to_async(django_cache.set, thread_sensitive=False)(FILE_ID_CACHE_KEY_PREFIX + image_url, file_id, None)
+
+
+async def _drop_file_id(image_url):
+    """Invalidate a stale Telegram file_id everywhere."""
+    FILE_ID_CACHE.pop(image_url, None)
+    await sync_to_async(django_cache.delete, thread_sensitive=False)(FILE_ID_CACHE_KEY_PREFIX + image_url)
+
 
 class Command(BaseCommand):
     help = 'Run the Telegram bot'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Profile the bot (yappi or cProfile + tracemalloc); stats are written to bot.prof on exit',
+        )
+
     def handle(self, *args, **options):
         """
         Main entry point for the management command.
@@ -37,19 +254,96 @@ class Command(BaseCommand):
             return
         
         self.stdout.write(self.style.SUCCESS('Starting Telegram bot...'))
-        
-        # Create the Application
-        application = Application.builder().token(token).build()
-        
+
+        # Opt-in profiling: yappi's wall clock understands asyncio, so
+        # awaited time shows up against the right coroutines; cProfile
+        # is the fallback. tracemalloc catches allocation churn.
+        profiling = options['profile']
+        profiler = None
+        yappi_mod = None
+        if profiling:
+            import tracemalloc
+            tracemalloc.start(25)
+            try:
+                import yappi
+                yappi_mod = yappi
+                yappi.set_clock_type('wall')
+                yappi.start(builtins=True)
+                logger.info("Profiling with yappi (wall clock)")
+            except ImportError:
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.enable()
+                logger.info("yappi not installed, profiling with cProfile")
+
+        # Use uvloop's C event loop when available — lower per-await
+        # overhead for the many small I/O tasks this bot runs
+        try:
+            import uvloop
+            uvloop.install()
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            logger.info("uvloop not installed, using default asyncio event loop")
+
+        # Create the Application.
+        # Non-blocking handlers + concurrent_updates let the event loop
+        # interleave many users' updates instead of serializing them
+        # behind one slow send_products call.
+        application = (
+            Application.builder()
+            .token(token)
+            .defaults(Defaults(block=False))
+            .concurrent_updates(32)
+            .rate_limiter(AIORateLimiter(max_retries=3))
+            .post_shutdown(_close_http_session)
+            .build()
+        )
+
         # Register handlers
         application.add_handler(CommandHandler("start", start))
         application.add_handler(CommandHandler("refresh", refresh_cache))
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
         application.add_handler(CallbackQueryHandler(handle_order_callback))
         
-        # Start the bot
+        # While profiling, log the top allocators every 5 minutes
+        if profiling and application.job_queue:
+            async def _log_allocators(job_context):
+                import tracemalloc
+                snapshot = tracemalloc.take_snapshot()
+                for stat in snapshot.statistics('lineno')[:20]:
+                    logger.info("tracemalloc: %s", stat)
+
+            application.job_queue.run_repeating(_log_allocators, interval=300, first=300)
+
+        # Start the bot.
+        # A 30s long-poll keeps getUpdates connections open instead of
+        # re-polling, and we only subscribe to the update types this bot
+        # actually handles.
         self.stdout.write(self.style.SUCCESS('Bot is running! Press Ctrl+C to stop.'))
-        application.run_polling(allowed_updates=Update.ALL_TYPES)
+        try:
+            application.run_polling(
+                timeout=30,
+                poll_interval=0.0,
+                allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY]
+            )
+        finally:
+            if profiling:
+                self._dump_profile(yappi_mod, profiler)
+
+    def _dump_profile(self, yappi_mod, profiler):
+        """Write profiler stats to bot.prof and log the top allocators."""
+        import tracemalloc
+        if yappi_mod is not None:
+            yappi_mod.stop()
+            yappi_mod.get_func_stats().save('bot.prof', type='pstat')
+        elif profiler is not None:
+            profiler.disable()
+            profiler.dump_stats('bot.prof')
+        self.stdout.write(self.style.SUCCESS('Profile written to bot.prof'))
+
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics('lineno')[:20]:
+            logger.info("tracemalloc: %s", stat)
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -83,7 +377,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         parse_mode=ParseMode.HTML
     )
     
-    logger.info(f"User {user.id} started the bot")
+    logger.info("User %s started the bot", user.id)
 
 
 async def refresh_cache(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -102,19 +396,38 @@ async def refresh_cache(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
     
     await update.message.reply_text(
-        "🔄 Refreshing data from Google Sheets...",
+        "🔄 Refresh started in the background...",
         parse_mode=ParseMode.HTML
     )
-    
-    # Refresh the cache
-    await sync_to_async(sheets_service.refresh_cache)()
-    
-    await update.message.reply_text(
-        "✅ Cache refreshed successfully!",
-        parse_mode=ParseMode.HTML
-    )
-    
-    logger.info(f"Cache refreshed by admin user {user.id}")
+
+    async def _do_refresh():
+        await sheets_service.arefresh_cache()
+
+        # Drop cached image bytes and file_ids in case images were
+        # replaced — including the copies persisted in Django's cache,
+        # which would otherwise repopulate FILE_ID_CACHE on the next
+        # lookup and serve the stale photo forever
+        urls = set(FILE_ID_CACHE)
+        for status in ('In-Stock', 'On The Way'):
+            cached = sheets_service.get_cached_products(status) or []
+            urls.update(p.image_link for p in cached if p.image_link)
+        IMAGE_CACHE.clear()
+        FILE_ID_CACHE.clear()
+        await sync_to_async(django_cache.delete_many, thread_sensitive=False)(
+            [FILE_ID_CACHE_KEY_PREFIX + url for url in urls]
+        )
+        await _warm_image_cache()
+
+        await context.bot.send_message(
+            chat_id=update.effective_chat.id,
+            text="✅ Cache refreshed successfully!",
+            parse_mode=ParseMode.HTML
+        )
+        logger.info("Cache refreshed by admin user %s", user.id)
+
+    # Run the refresh as a background task so the admin's chat isn't
+    # blocked while the whole sheet is re-fetched
+    context.application.create_task(_do_refresh())
 
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -125,22 +438,29 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     text = update.message.text
     user = update.effective_user
     
-    logger.info(f"User {user.id} pressed: {text}")
+    logger.info("User %s pressed: %s", user.id, text)
     
-    # Delete previous product messages if they exist (both bot and user messages)
-    if 'product_messages' in context.user_data and context.user_data['product_messages']:
-        for msg_id in context.user_data['product_messages']:
+    # Delete previous product messages plus the user's button click in one
+    # batched deleteMessages call (up to 100 IDs per request) instead of
+    # one API round trip per message
+    message_ids = list(context.user_data.get('product_messages', []))
+    message_ids.append(update.message.message_id)
+    context.user_data['product_messages'] = []
+
+    try:
+        # Telegram accepts at most 100 IDs per deleteMessages call
+        for i in range(0, len(message_ids), 100):
+            await context.bot.delete_messages(
+                chat_id=update.effective_chat.id,
+                message_ids=message_ids[i:i + 100]
+            )
+    except Exception as e:
+        logger.debug("Batch delete failed, falling back to per-message: %s", e)
+        for msg_id in message_ids:
             try:
                 await context.bot.delete_message(chat_id=update.effective_chat.id, message_id=msg_id)
             except Exception as e:
-                logger.debug(f"Could not delete message {msg_id}: {e}")
-        context.user_data['product_messages'] = []
-    
-    # Delete the user's button click message
-    try:
-        await update.message.delete()
-    except Exception as e:
-        logger.debug(f"Could not delete user message: {e}")
+                logger.debug("Could not delete message %s: %s", msg_id, e)
     
     if text == "📦 In Stock Products":
         await send_products(update, context, "In-Stock")
@@ -164,42 +484,67 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
     user = query.from_user
     admin_username = settings.TELEGRAM_ADMIN_USERNAME
     admin_chat_id = settings.TELEGRAM_ADMIN_CHAT_ID
-    
-    # Forward the product message to admin if admin chat ID is set
+
+    # Resolve the ordered product from the compact callback index ("o<id>")
+    product = None
+    if query.data and query.data.startswith('o'):
+        try:
+            product = sheets_service.get_by_id(int(query.data[1:]))
+        except ValueError:
+            pass
+
+    # Remove only the tapped product's button row; the other products
+    # in an album's shared buttons message stay orderable
+    new_markup = None
+    if query.message.reply_markup:
+        remaining = [
+            row for row in query.message.reply_markup.inline_keyboard
+            if not (row and row[0].callback_data == query.data)
+        ]
+        if remaining:
+            new_markup = InlineKeyboardMarkup(remaining)
+
+    # Notify admin if admin chat ID is set (the info text names the
+    # product — forwarding the tapped buttons message would not)
     if admin_chat_id:
         try:
-            # Forward the message with the product
-            await context.bot.forward_message(
-                chat_id=admin_chat_id,
-                from_chat_id=query.message.chat_id,
-                message_id=query.message.message_id
-            )
-            
-            # Send user info to admin
             user_info = (
                 f"📦 New Order Request:\n"
-                f"From: {user.first_name}"
+                + (f"Product: {product.name}\n" if product else "")
+                + f"From: {user.first_name}"
                 + (f" {user.last_name}" if user.last_name else "")
                 + (f" (@{user.username})" if user.username else "")
                 + f"\nUser ID: {user.id}"
             )
-            await context.bot.send_message(
-                chat_id=admin_chat_id,
-                text=user_info
-            )
-            
-            # Notify user
-            await query.edit_message_reply_markup(reply_markup=None)
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=f"✅ Order request sent to admin!\n\nContact: @{admin_username}",
-                parse_mode=ParseMode.HTML
+
+            # The three API calls are independent — run them in parallel
+            # so the order tap costs one round trip instead of three
+            results = await asyncio.gather(
+                context.bot.send_message(
+                    chat_id=admin_chat_id,
+                    text=user_info
+                ),
+                query.edit_message_reply_markup(reply_markup=new_markup),
+                context.bot.send_message(
+                    chat_id=query.message.chat_id,
+                    text=f"✅ Order request sent to admin!\n\nContact: @{admin_username}",
+                    parse_mode=ParseMode.HTML
+                ),
+                return_exceptions=True
             )
-            logger.info(f"Order forwarded from user {user.id} to admin {admin_chat_id}")
-            
+            # Surface the first failure (if any) without undoing the rest
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+            logger.info("Order forwarded from user %s to admin %s", user.id, admin_chat_id)
+
         except Exception as e:
-            logger.error(f"Error forwarding to admin: {str(e)}")
-            await query.edit_message_reply_markup(reply_markup=None)
+            logger.error("Error forwarding to admin: %s", e)
+            try:
+                # May already have succeeded as part of the batch above
+                await query.edit_message_reply_markup(reply_markup=new_markup)
+            except Exception:
+                pass
             await context.bot.send_message(
                 chat_id=query.message.chat_id,
                 text=f"Please contact @{admin_username} directly to place your order.",
@@ -207,7 +552,7 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
             )
     else:
         # No admin chat ID configured, just provide contact link
-        await query.edit_message_reply_markup(reply_markup=None)
+        await query.edit_message_reply_markup(reply_markup=new_markup)
         await context.bot.send_message(
             chat_id=query.message.chat_id,
             text=f"Please contact @{admin_username} to place your order.",
@@ -228,9 +573,16 @@ async def send_products(update: Update, context: ContextTypes.DEFAULT_TYPE, stat
     if 'product_messages' not in context.user_data:
         context.user_data['product_messages'] = []
     
-    # Fetch products from Google Sheets (using sync_to_async)
-    products = await sync_to_async(sheets_service.get_products_by_status)(status)
-    
+    # Serve from the cache and refresh it in the background when stale
+    # (stale-while-revalidate), so users never wait on Google Sheets.
+    # Cache reads are plain dict lookups, so no sync_to_async thread hop;
+    # only the very first request after startup has to fetch inline.
+    products = sheets_service.get_cached_products(status)
+    if products is None:
+        products = await sheets_service.aget(status)
+    elif sheets_service.is_cache_stale():
+        context.application.create_task(_refresh_and_warm())
+
     if not products:
         status_name = "In Stock" if status == "In-Stock" else "On The Way"
         msg = await update.message.reply_text(
@@ -240,28 +592,67 @@ async def send_products(update: Update, context: ContextTypes.DEFAULT_TYPE, stat
         context.user_data['product_messages'].append(msg.message_id)
         return
     
-    # Send a loading message
-    status_emoji = "📦" if status == "In-Stock" else "🚚"
-    status_name = "In Stock" if status == "In-Stock" else "On The Way"
-    
-    loading_msg = await update.message.reply_text(
-        f"{status_emoji} Loading {status_name} products...",
-        parse_mode=ParseMode.HTML
+    # Show a typing-style indicator instead of a "Loading..." message:
+    # no extra round trip to wait on and nothing to delete on the next tap
+    context.application.create_task(
+        context.bot.send_chat_action(
+            chat_id=update.effective_chat.id,
+            action=ChatAction.UPLOAD_PHOTO
+        )
     )
-    context.user_data['product_messages'].append(loading_msg.message_id)
-    
-    # Send each product with image and caption
-    for product in products:
+
+    # Resolve all images concurrently (file_id, cached bytes or download)
+    media_items = await asyncio.gather(
+        *(_get_image_media(product) for product in products)
+    )
+    with_media = [(p, m) for p, m in zip(products, media_items) if m is not None]
+    without_media = [p for p, m in zip(products, media_items) if m is None]
+
+    # Send albums of up to 10 photos per sendMediaGroup call. Media
+    # groups can't carry inline keyboards, so each album is followed by
+    # one message holding the Order buttons for its products.
+    for i in range(0, len(with_media), MEDIA_GROUP_SIZE):
+        chunk = with_media[i:i + MEDIA_GROUP_SIZE]
+        media_group = [
+            InputMediaPhoto(media=m, caption=p.caption, parse_mode=ParseMode.HTML)
+            for p, m in chunk
+        ]
+        try:
+            msgs = await context.bot.send_media_group(
+                chat_id=update.effective_chat.id,
+                media=media_group
+            )
+        except Exception as e:
+            logger.error("Error sending media group: %s", e)
+            # Fall back to per-product sends for this chunk
+            for p, _ in chunk:
+                msg = await send_product_details(update, p)
+                if msg:
+                    context.user_data['product_messages'].append(msg.message_id)
+            continue
+
+        for (p, _), msg in zip(chunk, msgs):
+            context.user_data['product_messages'].append(msg.message_id)
+            if msg.photo:
+                await _store_file_id(p.image_link, msg.photo[-1].file_id)
+
+        # Follow-up message with one Order button per product in the album
+        keyboard = [
+            [InlineKeyboardButton(f"🛒 {p.name[:40]}", callback_data=f"o{p.product_id}")]
+            for p, _ in chunk
+        ]
+        button_msg = await update.message.reply_text(
+            "🛒 Order တင်ရန် နှိပ်ပါ 👇",
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode=ParseMode.HTML
+        )
+        context.user_data['product_messages'].append(button_msg.message_id)
+
+    # Products without a usable image are sent individually as text
+    for product in without_media:
         msg = await send_product_details(update, product)
         if msg:
             context.user_data['product_messages'].append(msg.message_id)
-    
-    # Send completion message
-    completion_msg = await update.message.reply_text(
-        f"✅ Sent {len(products)} {status_name} product(s).",
-        parse_mode=ParseMode.HTML
-    )
-    context.user_data['product_messages'].append(completion_msg.message_id)
 
 
 async def send_product_details(update: Update, product: dict):
@@ -270,73 +661,70 @@ async def send_product_details(update: Update, product: dict):
     
     Args:
         update: Telegram update object
-        product: Product dictionary from Google Sheets
+        product: Product row from Google Sheets
         
     Returns:
         Message object or None
     """
     try:
-        # Build unit text (တစ် + unit from column)
-        unit_text = f"တစ်{product.get('unit', '')}" if product.get('unit') else ""
-        
-        # Create the caption with HTML formatting
-        caption = (
-            f"<b>{product['name']}</b>\n\n"
-            f"💰 Price: {product['price']} Kyat {unit_text}\n"
-            f"📊 Stock: {product['stock_count']} units"
-        )
-        
-        # Add expiry date if available
-        if product.get('expiry_date'):
-            caption += f"\n🗓 Expiry: {product['expiry_date']}"
-        
-        # Create inline keyboard with Order button (callback data stores product name)
-        product_data = f"order_{product['name'][:50]}"  # Limit to 50 chars for callback data
-        keyboard = [
-            [InlineKeyboardButton("🛒 Order တင်ရန်", callback_data=product_data)]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+        # Caption and keyboard are precomputed at cache-refresh time
+        # by the sheets service, so nothing is rebuilt per send
+        caption = product.caption
+        reply_markup = product.keyboard
+
         # Get the image URL from Google Sheets
-        image_url = product.get('image_link', '')
+        image_url = product.image_link
         
         # Send photo with caption
         if image_url:
+            # Fast path: re-send a previously uploaded photo by file_id
+            # (no bytes are transferred to Telegram at all)
+            file_id = await _get_file_id(image_url)
+            if file_id:
+                try:
+                    msg = await update.message.reply_photo(
+                        photo=file_id,
+                        caption=caption,
+                        parse_mode=ParseMode.HTML,
+                        reply_markup=reply_markup
+                    )
+                    return msg
+                except Exception as e:
+                    # file_id may have expired, fall back to re-uploading
+                    logger.warning("Cached file_id failed, re-uploading: %s", e)
+                    await _drop_file_id(image_url)
+
             try:
-                # Download image asynchronously with aiohttp
-                timeout = aiohttp.ClientTimeout(total=10)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(image_url) as response:
-                        if response.status == 200:
-                            image_data = await response.read()
-                            
-                            # Create a temporary file to store the image
-                            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-                                temp_file.write(image_data)
-                                temp_path = temp_file.name
-                            
-                            # Send the photo
-                            with open(temp_path, 'rb') as photo:
-                                msg = await update.message.reply_photo(
-                                    photo=photo,
-                                    caption=caption,
-                                    parse_mode=ParseMode.HTML,
-                                    reply_markup=reply_markup
-                                )
-                            
-                            # Clean up temp file
-                            os.unlink(temp_path)
-                            return msg
-                        else:
-                            # If image download fails, send text only
-                            msg = await update.message.reply_text(
-                                f"{caption}\n\n⚠️ Image not available",
-                                parse_mode=ParseMode.HTML,
-                                reply_markup=reply_markup
-                            )
-                            return msg
+                # Check the byte cache before hitting the network
+                image_data = _get_cached_image(image_url)
+
+                if image_data is None:
+                    # Download (fail-fast, circuit-breaker aware)
+                    image_data = await _download_image(image_url)
+
+                if image_data is not None:
+                    # Upload straight from memory; no tempfile round-trip
+                    msg = await update.message.reply_photo(
+                        photo=image_data,
+                        caption=caption,
+                        parse_mode=ParseMode.HTML,
+                        reply_markup=reply_markup
+                    )
+
+                    # Remember Telegram's file_id so future sends skip the upload
+                    if msg.photo:
+                        await _store_file_id(image_url, msg.photo[-1].file_id)
+                    return msg
+                else:
+                    # If image download fails, send text only
+                    msg = await update.message.reply_text(
+                        f"{caption}\n\n⚠️ Image not available",
+                        parse_mode=ParseMode.HTML,
+                        reply_markup=reply_markup
+                    )
+                    return msg
             except Exception as img_error:
-                logger.warning(f"Error downloading image: {str(img_error)}")
+                logger.warning("Error downloading image: %s", img_error)
                 msg = await update.message.reply_text(
                     f"{caption}\n\n⚠️ Image not available",
                     parse_mode=ParseMode.HTML,
@@ -353,9 +741,9 @@ async def send_product_details(update: Update, product: dict):
             return msg
             
     except Exception as e:
-        logger.error(f"Error sending product {product.get('name', 'Unknown')}: {str(e)}")
+        logger.error("Error sending product %s: %s", product.name, e)
         msg = await update.message.reply_text(
-            f"❌ Error loading product: {product.get('name', 'Unknown')}",
+            f"❌ Error loading product: {product.name}",
             parse_mode=ParseMode.HTML
         )
         return msg
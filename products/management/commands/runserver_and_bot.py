@@ -1,29 +1,55 @@
-import os
-import sys
-import threading
 import logging
-import aiohttp
 import asyncio
-import tempfile
-from urllib.parse import quote
+import uvicorn
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
 from django.conf import settings
-from asgiref.sync import sync_to_async
-from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler, ConversationHandler
+from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
+from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler, ConversationHandler, PicklePersistence
 from telegram.constants import ParseMode
+from telegram.error import BadRequest
 from products.sheets_service import sheets_service
-from products.models import UserProfile
+from products.models import OrderMessage, UserProfile
 
 # Conversation states
 ASK_NAME, ASK_PHONE, ASK_ADDRESS, CONFIRM_INFO = range(4)
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+# Telegram allows at most 10 photos per sendMediaGroup call
+MEDIA_GROUP_SIZE = 10
+
+# Immutable keyboards, built once at import instead of per message
+MAIN_MENU_MARKUP = ReplyKeyboardMarkup(
+    [
+        [KeyboardButton("📦 In-Stock ပစ္စည်းများ")],
+        [KeyboardButton("🚚 Pre-Order မှာယူနိုင်သောပစ္စည်းများ")]
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=False
+)
+
+# Keyboard label → sheet status, so handle_message dispatches with one
+# dict lookup instead of chained string comparisons
+BUTTON_STATUS = {
+    "📦 In-Stock ပစ္စည်းများ": "In-Stock",
+    "🚚 Pre-Order မှာယူနိုင်သောပစ္စည်းများ": "On The Way",
+}
+CANCEL_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]]
+)
+PROFILE_OPTIONS_MARKUP = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("✅ အချက်အလက်များကိုပြန်လည်အသုံးပြုပါ", callback_data="use_saved_info")],
+        [InlineKeyboardButton("📝 အချက်အလက်များကို ပြင်ဆင်ပါ", callback_data="update_info")],
+        [InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]
+    ]
 )
+
+# Configure logging only if Django's settings.LOGGING hasn't already
+# installed handlers — basicConfig at import time would double-log
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
 logger = logging.getLogger(__name__)
 
 
@@ -37,14 +63,21 @@ class Command(BaseCommand):
             default=8000,
             help='Port for Django development server (default: 8000)',
         )
+        parser.add_argument(
+            '--webhook-url',
+            default=settings.TELEGRAM_WEBHOOK_URL,
+            help='Public base URL for webhook mode; omit to use long polling',
+        )
 
     def handle(self, *args, **options):
         """
         Main entry point for the management command.
-        Runs Django server and Telegram bot in separate threads.
+        Runs Django (as ASGI under uvicorn) and the Telegram bot on one
+        event loop, instead of a runserver thread fighting the bot for
+        the GIL.
         """
         port = options['port']
-        
+
         # Check for Telegram bot token
         token = settings.TELEGRAM_BOT_TOKEN
         if not token:
@@ -52,40 +85,67 @@ class Command(BaseCommand):
                 self.style.ERROR('TELEGRAM_BOT_TOKEN is not set in environment variables!')
             )
             return
-        
+
         self.stdout.write(self.style.SUCCESS('=' * 60))
         self.stdout.write(self.style.SUCCESS('Starting Django Server + Telegram Bot'))
         self.stdout.write(self.style.SUCCESS('=' * 60))
-        
-        # Start Django development server in a separate thread
-        def run_django_server():
-            self.stdout.write(self.style.SUCCESS(f'🌐 Django server starting on http://127.0.0.1:{port}/'))
-            call_command('runserver', f'127.0.0.1:{port}', '--noreload')
-        
-        django_thread = threading.Thread(target=run_django_server, daemon=True)
-        django_thread.start()
-        
-        self.stdout.write(self.style.SUCCESS('🤖 Telegram bot starting...'))
-        
-        # Run bot in main thread
+
         try:
-            # Create the Application
-            application = Application.builder().token(token).build()
-            
+            # Create the Application. Persisting user_data means an
+            # order-in-progress (collecting_info state) survives restarts
+            # and deploys instead of silently dropping the conversation.
+            persistence = PicklePersistence(filepath=settings.BASE_DIR / 'bot_state.pkl')
+            application = Application.builder().token(token).persistence(persistence).build()
+
             # Register handlers
             application.add_handler(CommandHandler("start", start))
             application.add_handler(CommandHandler("refresh", refresh_cache))
             application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
             application.add_handler(CallbackQueryHandler(handle_order_callback))
             application.add_handler(MessageHandler(filters.REPLY & filters.ChatType.PRIVATE, handle_admin_reply))
-            
-            # Start the bot
+
+            webhook_url = options['webhook_url']
+            server = uvicorn.Server(uvicorn.Config(
+                'config.asgi:application',
+                host='127.0.0.1',
+                port=port,
+                loop='asyncio'
+            ))
+
+            async def _main():
+                # Start the bot manually so it shares the loop with uvicorn
+                await application.initialize()
+                await application.start()
+                if webhook_url:
+                    # Webhook mode: Telegram pushes updates to us; the
+                    # bot token doubles as an unguessable URL path
+                    await application.updater.start_webhook(
+                        listen='0.0.0.0',
+                        port=port + 1,
+                        url_path=token,
+                        webhook_url=f"{webhook_url.rstrip('/')}/{token}",
+                        allowed_updates=Update.ALL_TYPES
+                    )
+                else:
+                    # Polling fallback for development / no public URL
+                    await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+                try:
+                    # Runs until uvicorn receives a shutdown signal
+                    await server.serve()
+                finally:
+                    await application.updater.stop()
+                    await application.stop()
+                    await application.shutdown()
+
             self.stdout.write(self.style.SUCCESS('✅ Both services are running!'))
+            self.stdout.write(self.style.SUCCESS(f'🌐 Django (uvicorn): http://127.0.0.1:{port}/'))
             self.stdout.write(self.style.SUCCESS(f'📱 Django Admin: http://127.0.0.1:{port}/admin'))
-            self.stdout.write(self.style.SUCCESS('🤖 Telegram Bot: Active and polling'))
+            self.stdout.write(self.style.SUCCESS(
+                '🤖 Telegram Bot: Active (webhook)' if webhook_url else '🤖 Telegram Bot: Active and polling'
+            ))
             self.stdout.write(self.style.WARNING('\nPress Ctrl+C to stop both services\n'))
-            
-            application.run_polling(allowed_updates=Update.ALL_TYPES)
+
+            asyncio.run(_main())
         except KeyboardInterrupt:
             self.stdout.write(self.style.WARNING('\n\nShutting down...'))
         except Exception as e:
@@ -106,10 +166,14 @@ async def handle_admin_reply(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     replied_message_id = update.message.reply_to_message.message_id
-    
-    # Get customer ID from mapping
-    customer_id = context.bot_data.get('admin_customer_mapping', {}).get(replied_message_id)
-    
+
+    # Look up the customer for this order message (indexed PK lookup)
+    customer_id = await (
+        OrderMessage.objects.filter(message_id=replied_message_id)
+        .values_list('customer_id', flat=True)
+        .afirst()
+    )
+
     if not customer_id:
         await update.message.reply_text("❌ Could not find the customer for this order.")
         return
@@ -123,7 +187,7 @@ async def handle_admin_reply(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         await update.message.reply_text("✅ Message sent to customer!")
     except Exception as e:
-        logger.error(f"Error forwarding message to customer: {e}")
+        logger.error("Error forwarding message to customer: %s", e)
         await update.message.reply_text(f"❌ Failed to send message: {str(e)}")
 
 
@@ -133,18 +197,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     Send welcome message and display the main menu keyboard.
     """
     user = update.effective_user
-    
-    # Create custom keyboard with two buttons
-    keyboard = [
-        [KeyboardButton("📦 In-Stock ပစ္စည်းများ")],
-        [KeyboardButton("🚚 Pre-Order မှာယူနိုင်သောပစ္စည်းများ")]
-    ]
-    reply_markup = ReplyKeyboardMarkup(
-        keyboard,
-        resize_keyboard=True,
-        one_time_keyboard=False
-    )
-    
+
     welcome_message = (
         f"👋 မင်္ဂလာပါ {user.first_name},\n Yoma Supplier မှကြိုဆိုပါတယ်!\n\n"
         # f"လက်ရှိမှာယူနိုင်သော ပစ္စည်းများကိုကြည့်ရန် '📦 <b>In-Stock ပစ္စည်းများ</b>' ကိုနှိပ်ပါ\n\n"
@@ -153,11 +206,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     await update.message.reply_text(
         welcome_message,
-        reply_markup=reply_markup,
+        reply_markup=MAIN_MENU_MARKUP,
         parse_mode=ParseMode.HTML
     )
     
-    logger.info(f"User {user.id} started the bot")
+    logger.info("User %s started the bot", user.id)
 
 
 async def refresh_cache(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -181,14 +234,14 @@ async def refresh_cache(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     )
     
     # Refresh the cache
-    await sync_to_async(sheets_service.refresh_cache)()
+    await sheets_service.arefresh_cache()
     
     await update.message.reply_text(
         "✅ Cache refreshed successfully!",
         parse_mode=ParseMode.HTML
     )
     
-    logger.info(f"Cache refreshed by admin user {user.id}")
+    logger.info("Cache refreshed by admin user %s", user.id)
 
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -206,24 +259,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         if step == 'name':
             context.user_data['user_name'] = text
             context.user_data['info_step'] = 'phone'
-            # Add cancel button
-            keyboard = [[InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
             await update.message.reply_text(
                 "📞 ပစ္စည်းလက်ခံမည့်သူ၏ ဖုန်းနာမ်ပတ် ပေးပို့ပါ။",
-                reply_markup=reply_markup,
+                reply_markup=CANCEL_MARKUP,
                 parse_mode=ParseMode.HTML
             )
             return
         elif step == 'phone':
             context.user_data['user_phone'] = text
             context.user_data['info_step'] = 'address'
-            # Add cancel button
-            keyboard = [[InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
             await update.message.reply_text(
                 "📍 ပစ္စည်းလက်ခံမည့်သူ၏ လိပ်စာ ပေးပို့ပါ။",
-                reply_markup=reply_markup,
+                reply_markup=CANCEL_MARKUP,
                 parse_mode=ParseMode.HTML
             )
             return
@@ -232,20 +279,30 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             context.user_data['info_step'] = None
             context.user_data['collecting_info'] = False
             
-            # Save user profile
-            user_profile = await sync_to_async(UserProfile.objects.update_or_create)(
-                telegram_id=user.id,
-                defaults={
-                    'telegram_username': user.username or '',
-                    'first_name': user.first_name or '',
-                    'name': context.user_data['user_name'],
-                    'phone': context.user_data['user_phone'],
-                    'address': context.user_data['user_address'],
-                }
-            )
-            
+            # Save user profile — but skip the UPDATE (and its row lock)
+            # when a returning customer re-entered identical info
+            name = context.user_data['user_name']
+            phone = context.user_data['user_phone']
+            address = context.user_data['user_address']
+
+            user_profile = await UserProfile.objects.filter(telegram_id=user.id).afirst()
+            if user_profile is None or (
+                (user_profile.name, user_profile.phone, user_profile.address)
+                != (name, phone, address)
+            ):
+                user_profile, _ = await UserProfile.objects.aupdate_or_create(
+                    telegram_id=user.id,
+                    defaults={
+                        'telegram_username': user.username or '',
+                        'first_name': user.first_name or '',
+                        'name': name,
+                        'phone': phone,
+                        'address': address,
+                    }
+                )
+
             # Send order to admin
-            await send_order_to_admin(update, context, user_profile[0], update.effective_chat.id)
+            await send_order_to_admin(update, context, user_profile, update.effective_chat.id)
             
             await update.message.reply_text(
                 "✅ Order တင်ပြီးပါပြီ။\n\n"
@@ -256,12 +313,11 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
             return
     
-    logger.info(f"User {user.id} pressed: {text}")
-    
-    if text == "📦 In-Stock ပစ္စည်းများ":
-        await send_products(update, context, "In-Stock")
-    elif text == "🚚 Pre-Order မှာယူနိုင်သောပစ္စည်းများ":
-        await send_products(update, context, "On The Way")
+    logger.info("User %s pressed: %s", user.id, text)
+
+    status = BUTTON_STATUS.get(text)
+    if status:
+        await send_products(update, context, status)
     else:
         await update.message.reply_text(
             "ကျေးဇူးပြု၍ အောက်ပါ ခလုတ်များကို အသုံးပြု၍ ပစ္စည်းများကို ကြည့်ရှုပါ။",
@@ -280,18 +336,15 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
     if query.data == "use_saved_info":
         await query.answer()
         user = query.from_user
-        user_profile = await sync_to_async(UserProfile.objects.filter(telegram_id=user.id).first)()
+        user_profile = await UserProfile.objects.filter(telegram_id=user.id).afirst()
         await send_order_to_admin(update, context, user_profile, query.message.chat_id)
         await query.edit_message_text("✅ Order တင်ပြီးပါပြီ။ Yoma Supplier မှ ငွေကောက်ခံရန် အမြန်ဆုံးဆက်သွယ်ပေးပါမည်။")
         return
     elif query.data == "update_info":
         await query.answer()
-        # Add cancel button
-        keyboard = [[InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await query.edit_message_text(
             "📝 အချက်အလက်များကို ပြင်ဆင်ရန်:\n\n👤 နာမည်ပေးပို့ပါ။",
-            reply_markup=reply_markup
+            reply_markup=CANCEL_MARKUP
         )
         context.user_data['collecting_info'] = True
         context.user_data['info_step'] = 'name'
@@ -302,6 +355,7 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
         context.user_data['info_step'] = None
         context.user_data.pop('order_product_message_id', None)
         context.user_data.pop('order_product_chat_id', None)
+        context.user_data.pop('order_product_name', None)
         await query.edit_message_text(
             "❌ Order မတင်တော့ပါ။\n\n"
             "ပစ္စည်းများကို ကြည့်ရှုရန် အောက်ပါခလုတ်များကို အသုံးပြုပါ။"
@@ -310,23 +364,33 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
     
     await query.answer()
     user = query.from_user
-    
-    # Check if user has a profile
-    user_profile = await sync_to_async(UserProfile.objects.filter(telegram_id=user.id).first)()
-    
-    # Store product message details for later
-    context.user_data['order_product_message_id'] = query.message.message_id
-    context.user_data['order_product_chat_id'] = query.message.chat_id
-    
+
+    # Check if user has a profile (async ORM: no sync_to_async thread handoff;
+    # the unique telegram_id index serves the lookup)
+    user_profile = await UserProfile.objects.filter(telegram_id=user.id).afirst()
+
+    # Resolve the ordered product at tap time from the compact callback
+    # data ("o<id>"), so the admin notification can name it
+    product = None
+    if query.data and query.data.startswith('o'):
+        try:
+            product = sheets_service.get_by_id(int(query.data[1:]))
+        except ValueError:
+            pass
+    context.user_data['order_product_name'] = product.name if product else ''
+
+    # Forward the tapped message to the admin only when it is the
+    # product photo itself — the shared album-buttons message would
+    # tell the admin nothing
+    if query.message.photo:
+        context.user_data['order_product_message_id'] = query.message.message_id
+        context.user_data['order_product_chat_id'] = query.message.chat_id
+    else:
+        context.user_data.pop('order_product_message_id', None)
+        context.user_data.pop('order_product_chat_id', None)
+
     if user_profile:
         # User has profile, show options
-        keyboard = [
-            [InlineKeyboardButton("✅ အချက်အလက်များကိုပြန်လည်အသုံးပြုပါ", callback_data="use_saved_info")],
-            [InlineKeyboardButton("📝 အချက်အလက်များကို ပြင်ဆင်ပါ", callback_data="update_info")],
-            [InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         profile_text = (
             f"📋 သင်၏ သိမ်းဆည်းထားသော အချက်အလက်များ:\n\n"
             f"👤 နာမည်: {user_profile.name}\n"
@@ -334,22 +398,21 @@ async def handle_order_callback(update: Update, context: ContextTypes.DEFAULT_TY
             f"📍 လိပ်စာ: {user_profile.address}\n\n"
             f"✅ အချက်အလက်များကို အသုံးပြုရန် သို့မဟုတ် ပြင်ဆင်ရန် ရွေးချယ်ပါ။")
         
-        await context.bot.send_message(
-            chat_id=query.message.chat_id,
-            text=profile_text,
-            reply_markup=reply_markup,
+        # Reply off the product message rather than a bare send_message;
+        # same single Bot API call, but keeps the summary anchored to
+        # the product being ordered
+        await query.message.reply_text(
+            profile_text,
+            reply_markup=PROFILE_OPTIONS_MARKUP,
             parse_mode=ParseMode.HTML
         )
     else:
         # No profile, start registration
         await query.edit_message_reply_markup(reply_markup=None)
-        # Add cancel button
-        keyboard = [[InlineKeyboardButton("❌ မလုပ်တော့ပါ (Cancel)", callback_data="cancel_info")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await context.bot.send_message(
             chat_id=query.message.chat_id,
             text="📝 Order တင်ရန် သင်၏အချက်အလက်များကိုဖြည့်ပါ။ \n\n👤 နာမည်ပေးပို့ပါ။",
-            reply_markup=reply_markup,
+            reply_markup=CANCEL_MARKUP,
             parse_mode=ParseMode.HTML
         )
         context.user_data['collecting_info'] = True
@@ -385,9 +448,12 @@ async def send_order_to_admin(update: Update, context: ContextTypes.DEFAULT_TYPE
         telegram_contact = f"@{user_profile.telegram_username}" if user_profile.telegram_username else f"{user_profile.first_name}"
         user_link = f"<a href='tg://user?id={user_profile.telegram_id}'>{telegram_contact}</a>"
         
+        product_name = context.user_data.get('order_product_name', '')
+
         customer_info = (
-            f"📦 NEW ORDER REQUEST\n\n"
-            f"👤 Name: {user_profile.name}\n"
+            "📦 NEW ORDER REQUEST\n\n"
+            + (f"🛒 Product: {product_name}\n" if product_name else "")
+            + f"👤 Name: {user_profile.name}\n"
             f"📞 Phone: {user_profile.phone}\n"
             f"📍 Address: {user_profile.address}\n\n"
             f"💬 Contact Customer: {user_link}\n"
@@ -401,18 +467,20 @@ async def send_order_to_admin(update: Update, context: ContextTypes.DEFAULT_TYPE
             parse_mode=ParseMode.HTML
         )
         
-        # Store customer ID mapping for admin replies
-        if 'admin_customer_mapping' not in context.bot_data:
-            context.bot_data['admin_customer_mapping'] = {}
-        context.bot_data['admin_customer_mapping'][sent_message.message_id] = user_profile.telegram_id
+        # Persist the admin-message -> customer mapping so replies
+        # survive restarts and work across bot replicas
+        await OrderMessage.objects.acreate(
+            message_id=sent_message.message_id,
+            customer_id=user_profile.telegram_id
+        )
         
         # Clear temporary data
         context.user_data.pop('order_product_message_id', None)
         context.user_data.pop('order_product_chat_id', None)
         
-        logger.info(f"Order sent to admin from user {user_profile.telegram_id}")
+        logger.info("Order sent to admin from user %s", user_profile.telegram_id)
     except Exception as e:
-        logger.error(f"Error sending order to admin: {str(e)}")
+        logger.error("Error sending order to admin: %s", e)
         await context.bot.send_message(
             chat_id=chat_id,
             text=f"There was an error. Please contact @{admin_username} directly.",
@@ -429,8 +497,9 @@ async def send_products(update: Update, context: ContextTypes.DEFAULT_TYPE, stat
         context: Context for storing message IDs
         status: Product status ("In-Stock" or "On The Way")
     """
-    # Fetch products from Google Sheets (using sync_to_async)
-    products = await sync_to_async(sheets_service.get_products_by_status)(status)
+    # Fetch products from Google Sheets (blocking work runs on a
+    # worker thread inside aget)
+    products = await sheets_service.aget(status)
     
     if not products:
         status_name = "In Stock" if status == "In-Stock" else "On The Way"
@@ -444,17 +513,56 @@ async def send_products(update: Update, context: ContextTypes.DEFAULT_TYPE, stat
     status_emoji = "📦" if status == "In-Stock" else "🚚"
     status_name = "In Stock" if status == "In-Stock" else "On The Way"
     
-    await update.message.reply_text(
+    # Sent once and edited into the completion message afterwards — one
+    # message (and one fewer Bot API call) instead of loading + done
+    loader = await update.message.reply_text(
         f"{status_emoji} Loading {status_name} products...",
         parse_mode=ParseMode.HTML
     )
-    
-    # Send each product with image and caption
-    for product in products:
+
+    # Send albums of up to 10 photos per sendMediaGroup call — one HTTP
+    # round trip and one flood-limit unit per album. Media groups can't
+    # carry inline keyboards, so each album is followed by a single
+    # message with the Order buttons for its products.
+    with_image = [p for p in products if p.image_link]
+    without_image = [p for p in products if not p.image_link]
+
+    for i in range(0, len(with_image), MEDIA_GROUP_SIZE):
+        chunk = with_image[i:i + MEDIA_GROUP_SIZE]
+        media = [
+            InputMediaPhoto(
+                media=p.image_link,
+                caption=p.caption_mm,
+                parse_mode=ParseMode.HTML
+            )
+            for p in chunk
+        ]
+        try:
+            await update.message.reply_media_group(media=media)
+        except Exception as e:
+            logger.error("Error sending media group: %s", e)
+            # Fall back to per-product sends for this chunk
+            for p in chunk:
+                await send_product_details(update, p)
+            continue
+
+        # One follow-up message carrying the Order buttons for the album
+        keyboard = [
+            [InlineKeyboardButton(f"🛒 {p.name[:40]}", callback_data=f"o{p.product_id}")]
+            for p in chunk
+        ]
+        await update.message.reply_text(
+            "🛒 Order တင်ရန် နှိပ်ပါ 👇",
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode=ParseMode.HTML
+        )
+
+    # Products without an image are sent individually as text
+    for product in without_image:
         await send_product_details(update, product)
-    
-    # Send completion message
-    await update.message.reply_text(
+
+    # Edit the loader into the completion message
+    await loader.edit_text(
         f"✅ Sent {len(products)} {status_name} product(s).",
         parse_mode=ParseMode.HTML
     )
@@ -466,73 +574,36 @@ async def send_product_details(update: Update, product: dict):
     
     Args:
         update: Telegram update object
-        product: Product dictionary from Google Sheets
+        product: Product row from Google Sheets
         
     Returns:
         Message object or None
     """
     try:
-        # Build unit text (တစ် + unit from column)
-        unit_text = f"{product.get('unit', '')}" if product.get('unit') else ""
-        
-        # Create the caption with HTML formatting
-        caption = (
-            f"<b>{product['name']}</b>\n\n"
-            f"💰 စျေးနှုန်း: တစ်{unit_text} {product['price']} Kyat \n"
-            f"📊 ပစ္စည်းလက်ကျန်: {product['stock_count']} {unit_text}"
-        )
-        
-        # Add expiry date if available
-        if product.get('expiry_date'):
-            caption += f"\n🗓 သက်တမ်းကုန်ဆုံးရက်: {product['expiry_date']}"
-        
-        # Create inline keyboard with Order button (callback data stores product name)
-        product_data = f"order_{product['name'][:50]}"  # Limit to 50 chars for callback data
-        keyboard = [
-            [InlineKeyboardButton("🛒 Order တင်ရန်", callback_data=product_data)]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+        # Caption and keyboard are precomputed at cache-refresh time by
+        # the sheets service, so nothing is rebuilt per send
+        caption = product.caption_mm
+        reply_markup = product.keyboard
+
         # Get the image URL from Google Sheets
-        image_url = product.get('image_link', '')
+        image_url = product.image_link
         
         # Send photo with caption
         if image_url:
             try:
-                # Download image asynchronously with aiohttp
-                timeout = aiohttp.ClientTimeout(total=10)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(image_url) as response:
-                        if response.status == 200:
-                            image_data = await response.read()
-                            
-                            # Create a temporary file to store the image
-                            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-                                temp_file.write(image_data)
-                                temp_path = temp_file.name
-                            
-                            # Send the photo
-                            with open(temp_path, 'rb') as photo:
-                                msg = await update.message.reply_photo(
-                                    photo=photo,
-                                    caption=caption,
-                                    parse_mode=ParseMode.HTML,
-                                    reply_markup=reply_markup
-                                )
-                            
-                            # Clean up temp file
-                            os.unlink(temp_path)
-                            return msg
-                        else:
-                            # If image download fails, send text only
-                            msg = await update.message.reply_text(
-                                f"{caption}\n\n⚠️ Image not available",
-                                parse_mode=ParseMode.HTML,
-                                reply_markup=reply_markup
-                            )
-                            return msg
-            except Exception as img_error:
-                logger.warning(f"Error downloading image: {str(img_error)}")
+                # Pass the URL straight to Telegram so it fetches the
+                # image server-side — no local download, temp file or
+                # re-upload on our end
+                msg = await update.message.reply_photo(
+                    photo=image_url,
+                    caption=caption,
+                    parse_mode=ParseMode.HTML,
+                    reply_markup=reply_markup
+                )
+                return msg
+            except BadRequest as img_error:
+                # Telegram rejected the URL; fall back to text only
+                logger.warning("Telegram could not fetch image %s: %s", image_url, img_error)
                 msg = await update.message.reply_text(
                     f"{caption}\n\n⚠️ Image not available",
                     parse_mode=ParseMode.HTML,
@@ -549,9 +620,9 @@ async def send_product_details(update: Update, product: dict):
             return msg
             
     except Exception as e:
-        logger.error(f"Error sending product {product.get('name', 'Unknown')}: {str(e)}")
+        logger.error("Error sending product %s: %s", product.name, e)
         msg = await update.message.reply_text(
-            f"❌ Error loading product: {product.get('name', 'Unknown')}",
+            f"❌ Error loading product: {product.name}",
             parse_mode=ParseMode.HTML
         )
         return msg
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.17 on 2026-08-30 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_userprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderMessage',
+            fields=[
+                ('message_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Admin Message ID')),
+                ('customer_id', models.BigIntegerField(db_index=True, verbose_name='Customer Telegram ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Order Message',
+                'verbose_name_plural': 'Order Messages',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -23,6 +23,25 @@ class UserProfile(models.Model):
         return f"{self.name} (@{self.telegram_username or self.telegram_id})"
 
 
+class OrderMessage(models.Model):
+    """
+    Maps an admin-notification message to the ordering customer, so
+    admin replies can be routed back to the right chat even after a
+    bot restart.
+    """
+    message_id = models.BigIntegerField(primary_key=True, verbose_name='Admin Message ID')
+    customer_id = models.BigIntegerField(db_index=True, verbose_name='Customer Telegram ID')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
+
+    class Meta:
+        verbose_name = 'Order Message'
+        verbose_name_plural = 'Order Messages'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Order message {self.message_id} → customer {self.customer_id}"
+
+
 class Product(models.Model):
     """
     Product model for managing inventory items.
@@ -1,14 +1,71 @@
 """
 Google Sheets service for fetching product data.
 """
+import re
+import threading
+import time
+from dataclasses import dataclass
+from itertools import zip_longest
 import gspread
 from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
+from django.core.cache import cache as django_cache
+from asgiref.sync import sync_to_async
 from datetime import datetime, timedelta
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Invalidation marker in Django's (file-based, cross-process) cache, so
+# the sheets webhook hitting the web process also dirties the cache of
+# a separately running bot process
+_INVALIDATED_AT_KEY = 'sheets_service:invalidated_at'
+
+# Matches the file id in the common Google Drive link forms
+# (uc?id=..., open?id=..., file/d/...)
+_DRIVE_FILE_ID_RE = re.compile(
+    r'drive\.google\.com/(?:uc\?(?:export=\w+&)?id=|file/d/|open\?id=)([\w-]+)'
+)
+
+# Caption templates, filled once per product at refresh time.
+# runbot uses the English template; runserver_and_bot the Burmese one.
+CAPTION_TEMPLATE = (
+    "<b>{name}</b>\n\n"
+    "💰 Price: {price} Kyat {unit_text}\n"
+    "📊 Stock: {stock_count} units"
+    "{expiry_suffix}"
+)
+
+CAPTION_TEMPLATE_MM = (
+    "<b>{name}</b>\n\n"
+    "💰 စျေးနှုန်း: တစ်{unit} {price} Kyat \n"
+    "📊 ပစ္စည်းလက်ကျန်: {stock_count} {unit}"
+    "{expiry_suffix}"
+)
+
+
+@dataclass(slots=True)
+class Product:
+    """
+    One parsed sheet row. Slots keep the per-row footprint well below a
+    dict's and make attribute access a fixed-offset load.
+    """
+    product_id: int
+    name: str
+    image_link: str
+    price: str
+    unit: str
+    stock_count: str
+    status: str
+    expiry_date: str
+    # Filled in right after construction, once per refresh
+    caption: str = ''
+    caption_mm: str = ''
+    keyboard: InlineKeyboardMarkup = None
+
 
 class GoogleSheetsService:
     """Service to interact with Google Sheets with caching."""
@@ -20,11 +77,30 @@ class GoogleSheetsService:
         self.worksheet_name = settings.GOOGLE_SHEETS_WORKSHEET_NAME
         self.client = None
         self.worksheet = None
+        self._spreadsheet = None
+        self._creds = None
+        self._worksheet_id = None
         
         # Cache settings
         self._cache = {}
         self._cache_timestamp = None
-        self._cache_duration = timedelta(minutes=5)  # Cache for 5 minutes
+        self._cache_duration = timedelta(seconds=settings.SHEETS_CACHE_TTL)
+
+        # Serializes refreshes so concurrent cache misses trigger one
+        # sheet fetch instead of a stampede
+        self._refresh_lock = threading.Lock()
+
+        # Products indexed by their stable row-based id, for O(1)
+        # lookups from compact callback data
+        self._products_by_id = {}
+
+        # Whether the most recent fetch actually reached the sheet, so
+        # failed refreshes don't clobber good cached data
+        self._last_fetch_ok = False
+
+        # Raw column blocks from the previous fetch, to short-circuit
+        # re-parsing when the sheet hasn't changed
+        self._last_raw = None
         
     def connect(self):
         """Connect to Google Sheets."""
@@ -34,94 +110,230 @@ class GoogleSheetsService:
                 'https://www.googleapis.com/auth/spreadsheets.readonly',
                 'https://www.googleapis.com/auth/drive.readonly'
             ]
-            
-            # Authenticate using the service account
-            creds = Credentials.from_service_account_file(
-                self.credentials_file,
-                scopes=scope
-            )
-            
-            # Create the client
-            self.client = gspread.authorize(creds)
-            
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            
-            # Get the specific worksheet
-            self.worksheet = spreadsheet.worksheet(self.worksheet_name)
+
+            # Parse the service-account key file only once per process;
+            # token refreshes happen on the session, not from disk
+            if self._creds is None:
+                self._creds = Credentials.from_service_account_file(
+                    self.credentials_file,
+                    scopes=scope
+                )
+
+            if self.client is None:
+                self.client = gspread.authorize(self._creds)
+
+                # Size the connection pool and add retry/backoff on the
+                # client's long-lived session, so bursts of Sheets calls
+                # reuse one warm TLS connection instead of re-handshaking
+                # and transient 429/5xx responses are retried transparently
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=16,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                    )
+                )
+                session = self.client.http_client.session
+                session.mount('https://', adapter)
+                self.client.http_client.set_timeout((5, 30))  # (connect, read)
+
+            # Open the spreadsheet (kept for later range queries)
+            self._spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+
+            # Resolve the worksheet by name once, then by its immutable
+            # sheet id afterwards (skips the name lookup's metadata scan)
+            if self._worksheet_id is not None:
+                self.worksheet = self._spreadsheet.get_worksheet_by_id(self._worksheet_id)
+            else:
+                self.worksheet = self._spreadsheet.worksheet(self.worksheet_name)
+                self._worksheet_id = self.worksheet.id
             
             logger.info("Successfully connected to Google Sheets")
             return True
             
         except Exception as e:
-            logger.error(f"Error connecting to Google Sheets: {str(e)}")
+            logger.error("Error connecting to Google Sheets: %s", e)
             return False
     
     def _is_cache_valid(self):
-        """Check if cache is still valid."""
+        """Check if cache is still valid (TTL and webhook invalidation)."""
         if self._cache_timestamp is None:
             return False
+        # A webhook invalidation may have been recorded by another
+        # process (web vs bot); anything fetched before it is stale
+        invalidated_at = django_cache.get(_INVALIDATED_AT_KEY)
+        if invalidated_at is not None and self._cache_timestamp.timestamp() <= invalidated_at:
+            return False
         return datetime.now() - self._cache_timestamp < self._cache_duration
     
+    # Shape returned by every _fetch_all_products exit path, so callers
+    # can .get(status, []) without type checks
+    _EMPTY_CACHE = {'In-Stock': [], 'On The Way': []}
+
     def _fetch_all_products(self):
-        """Fetch all products from Google Sheets and cache them."""
+        """
+        Fetch all products from Google Sheets.
+
+        Always returns a dict keyed by status (even on failure), so
+        callers never have to branch on the result's type.
+        """
+        self._last_fetch_ok = False
         try:
             if not self.worksheet:
                 if not self.connect():
-                    return {}
-            
-            # Get all values from the sheet
-            all_records = self.worksheet.get_all_values()
-            
-            # Skip the header row (first row)
-            if len(all_records) <= 1:
-                return {}
+                    return dict(self._EMPTY_CACHE)
             
+            # Fetch only the columns we actually use, in one batchGet
+            # round trip, instead of every cell in the sheet:
+            # B (Item Name), D (Image Link), F (Wholesale), H (Unit 1),
+            # L:N (QTY On Hand, Status, Expiry Date). COLUMNS major
+            # dimension gives plain per-column value lists, so rows can
+            # be rebuilt without unwrapping one-cell row lists.
+            ranges = ['B2:B', 'D2:D', 'F2:F', 'H2:H', 'L2:N']
+            try:
+                blocks = self.worksheet.batch_get(ranges, major_dimension='COLUMNS')
+            except gspread.exceptions.APIError as e:
+                # Expired credentials: re-authorize once and retry
+                if e.response.status_code != 401:
+                    raise
+                logger.info("Sheets auth expired, reconnecting...")
+                self.client = None
+                self.worksheet = None
+                self._spreadsheet = None
+                if not self.connect():
+                    return dict(self._EMPTY_CACHE)
+                blocks = self.worksheet.batch_get(ranges, major_dimension='COLUMNS')
+
+            # The values API has no ETag support, but we can still skip
+            # the parse and caption/keyboard rebuild when the payload is
+            # byte-identical to the previous refresh — the common case
+            # for a catalog that changes a few times a day
+            if blocks == self._last_raw and self._cache:
+                logger.info("Sheet unchanged since last refresh; keeping parsed cache")
+                self._last_fetch_ok = True
+                return self._cache
+            self._last_raw = blocks
+
+            # An all-empty range comes back without values; pad so each
+            # single-column block unpacks and L:N yields three columns
+            names, images, prices, units = (
+                block[0] if block else [] for block in blocks[:4]
+            )
+            qtys, statuses, expiries = (list(blocks[4]) + [[], [], []])[:3]
+
             products_by_status = {'In-Stock': [], 'On The Way': []}
-            
-            # Process each row (starting from row 2, index 1)
-            for row in all_records[1:]:
-                # Ensure row has enough columns
-                if len(row) < 13:
-                    continue
-                
-                # Column indices (0-based):
-                # A=0 (Id), B=1 (Item Name), D=3 (Image Link), F=5 (Wholesale),
-                # H=7 (Unit 1), L=11 (QTY On Hand), M=12 (Status), N=13 (Expiry Date)
-                item_name = row[1].strip() if len(row) > 1 else ""
-                image_link = row[3].strip() if len(row) > 3 else ""
-                wholesale_price = row[5].strip().lstrip('K') if len(row) > 5 else ""
-                unit = row[7].strip() if len(row) > 7 else ""
-                qty_on_hand = row[11].strip() if len(row) > 11 else ""
-                item_status = row[12].strip() if len(row) > 12 else ""
-                expiry_date = row[13].strip() if len(row) > 13 else ""
-                
-                # Skip empty rows
+            products_by_id = {}
+
+            # Zip the columns back together row-wise (trailing blanks
+            # are trimmed per column, hence zip_longest), whitespace-
+            # normalizing all seven fields in one map pass
+            for offset, fields in enumerate(
+                zip_longest(names, images, prices, units, qtys, statuses, expiries, fillvalue='')
+            ):
+                item_name, image_link, wholesale_price, unit, qty_on_hand, item_status, expiry_date = map(str.strip, fields)
+
+                # Skip empty rows before parsing anything else
                 if not item_name:
                     continue
-                
-                # Create product dict
-                product = {
-                    'name': item_name,
-                    'image_link': image_link,
-                    'price': wholesale_price,
-                    'unit': unit,
-                    'stock_count': qty_on_hand,
-                    'status': item_status,
-                    'expiry_date': expiry_date,
-                }
-                
-                # Group by status
-                if item_status in products_by_status:
-                    products_by_status[item_status].append(product)
-            
-            logger.info(f"Fetched {len(products_by_status.get('In-Stock', []))} In-Stock and {len(products_by_status.get('On The Way', []))} On The Way products")
+
+                row_index = offset + 2
+                image_link = self._normalize_image_link(image_link)
+                wholesale_price = wholesale_price.lstrip('K')
+
+                # Create the product row (the sheet row number doubles
+                # as a stable, compact product id for callback data)
+                product = Product(
+                    product_id=row_index,
+                    name=item_name,
+                    image_link=image_link,
+                    price=wholesale_price,
+                    unit=unit,
+                    stock_count=qty_on_hand,
+                    status=item_status,
+                    expiry_date=expiry_date,
+                )
+
+                # Precompute the captions and keyboard once per refresh so
+                # the bots don't rebuild them on every send
+                product.caption = self._build_caption(product)
+                product.caption_mm = self._build_caption_mm(product)
+                product.keyboard = self._build_keyboard(product)
+
+                products_by_id[row_index] = product
+
+                # Group by status (single dict lookup via setdefault)
+                products_by_status.setdefault(item_status, []).append(product)
+
+            self._products_by_id = products_by_id
+            self._last_fetch_ok = True
+
+            logger.info(
+                "Fetched %d In-Stock and %d On The Way products",
+                len(products_by_status.get('In-Stock', [])),
+                len(products_by_status.get('On The Way', []))
+            )
             return products_by_status
             
         except Exception as e:
-            logger.error(f"Error fetching products: {str(e)}")
-            return {}
+            logger.error("Error fetching products: %s", e)
+            return dict(self._EMPTY_CACHE)
     
+    def _normalize_image_link(self, url):
+        """
+        Rewrite Google-hosted image links to a pre-sized thumbnail.
+
+        Full-resolution Drive images can be several MB; the thumbnail
+        variants are 10-100x smaller and plenty for a chat photo. Runs
+        once per refresh so the send path never pays for it.
+        """
+        if not url:
+            return url
+        match = _DRIVE_FILE_ID_RE.search(url)
+        if match:
+            return f"https://drive.google.com/thumbnail?id={match.group(1)}&sz=w512"
+        if 'googleusercontent.com' in url:
+            # Replace any existing size suffix with a bounded one
+            return f"{url.split('=')[0]}=w512-h512"
+        return url
+
+    def _build_caption(self, product):
+        """Fill the precompiled caption template for a product."""
+        return CAPTION_TEMPLATE.format_map({
+            'name': product.name,
+            'price': product.price,
+            'unit_text': f"တစ်{product.unit}" if product.unit else "",
+            'stock_count': product.stock_count,
+            'expiry_suffix': (
+                f"\n🗓 Expiry: {product.expiry_date}" if product.expiry_date else ""
+            ),
+        })
+
+    def _build_caption_mm(self, product):
+        """Fill the precompiled Burmese caption template for a product."""
+        return CAPTION_TEMPLATE_MM.format_map({
+            'name': product.name,
+            'price': product.price,
+            'unit': product.unit,
+            'stock_count': product.stock_count,
+            'expiry_suffix': (
+                f"\n🗓 သက်တမ်းကုန်ဆုံးရက်: {product.expiry_date}" if product.expiry_date else ""
+            ),
+        })
+
+    def _build_keyboard(self, product):
+        """Build the inline Order keyboard for a product message."""
+        # Callback data carries just the compact product id ("o<id>")
+        # instead of a truncated product name
+        return InlineKeyboardMarkup([
+            [InlineKeyboardButton("🛒 Order တင်ရန်", callback_data=f"o{product.product_id}")]
+        ])
+
+    def get_by_id(self, product_id):
+        """Get a cached product by its row-based id, or None."""
+        return self._products_by_id.get(product_id)
+
     def get_products_by_status(self, status):
         """
         Get products by status from Google Sheets (with caching).
@@ -130,25 +342,108 @@ class GoogleSheetsService:
             status: Either "In-Stock" or "On The Way"
         
         Returns:
-            List of product dictionaries
+            List of Product rows
         """
         # Check if cache is valid
         if not self._is_cache_valid():
-            logger.info("Cache expired or empty, fetching from Google Sheets...")
-            self._cache = self._fetch_all_products()
-            self._cache_timestamp = datetime.now()
+            with self._refresh_lock:
+                # Another caller may have refreshed while we waited
+                if not self._is_cache_valid():
+                    logger.info("Cache expired or empty, fetching from Google Sheets...")
+                    self._store_fetch_result(self._fetch_all_products())
         else:
             logger.info("Using cached data")
-        
+
         return self._cache.get(status, [])
     
+    def get_cached_products(self, status):
+        """
+        Get products for a status straight from the cache, without ever
+        hitting the network.
+
+        Returns:
+            List of Product rows, or None if nothing has been
+            cached yet (callers should fall back to a blocking fetch)
+        """
+        if self._cache_timestamp is None:
+            return None
+        return self._cache.get(status, [])
+
+    def invalidate(self):
+        """
+        Mark the cache dirty so the next read refetches, without doing
+        any network work here. Called from the sheets webhook when the
+        spreadsheet reports a change, which lets the TTL be generous.
+
+        The marker goes through Django's file-based cache so it also
+        reaches a bot running in a separate process from the web server
+        that handled the webhook.
+        """
+        self._cache_timestamp = None
+        django_cache.set(_INVALIDATED_AT_KEY, time.time(), None)
+        logger.info("Sheets cache invalidated by webhook")
+
+    def is_cache_stale(self):
+        """Check if the cache has data but its TTL has expired."""
+        return self._cache_timestamp is not None and not self._is_cache_valid()
+
+    def _store_fetch_result(self, fetched):
+        """
+        Install a fetch result into the cache.
+
+        A failed fetch (rate-limited past the HTTP retries, credentials
+        problem, ...) keeps serving the previous data for another TTL
+        window instead of replacing it with an empty catalog.
+        """
+        if self._last_fetch_ok or not self._cache:
+            self._cache = fetched
+        else:
+            logger.warning("Sheet fetch failed; keeping previous cache for another TTL window")
+        self._cache_timestamp = datetime.now()
+
     def refresh_cache(self):
         """Manually refresh the cache."""
-        logger.info("Manually refreshing cache...")
-        self._cache = self._fetch_all_products()
-        self._cache_timestamp = datetime.now()
-        return self._cache
+        with self._refresh_lock:
+            logger.info("Manually refreshing cache...")
+            self._store_fetch_result(self._fetch_all_products())
+            return self._cache
     
+    async def aget(self, status):
+        """
+        Async wrapper around get_products_by_status for the bots' event
+        loops — runs the (possibly blocking) fetch on a worker thread.
+        """
+        return await sync_to_async(self.get_products_by_status, thread_sensitive=False)(status)
+
+    async def arefresh_cache(self):
+        """Async wrapper around refresh_cache."""
+        return await sync_to_async(self.refresh_cache, thread_sensitive=False)()
+
+    def get_products(self, statuses=frozenset({"In-Stock", "On The Way"})):
+        """
+        Get products for several statuses from one cached fetch.
+
+        Args:
+            statuses: Set of status strings to include
+
+        Returns:
+            Dict mapping each requested status to its list of Product
+            rows — one API call (at most) regardless of how many
+            statuses are asked for
+        """
+        # Any status goes through the shared TTL-cached fetch
+        self.get_products_by_status("In-Stock")
+        return {s: self._cache.get(s, []) for s in statuses}
+
+    def get_all_statuses(self):
+        """
+        Get the full status → products dict from one fetch, for callers
+        that need both lists (e.g. cache warming).
+        """
+        # Any status goes through the shared TTL-cached fetch
+        self.get_products_by_status("In-Stock")
+        return self._cache
+
     def get_in_stock_products(self):
         """Get all in-stock products."""
         return self.get_products_by_status("In-Stock")
@@ -1,3 +1,25 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
-# Create your views here.
+from .sheets_service import sheets_service
+
+
+@csrf_exempt
+@require_POST
+def sheets_webhook(request):
+    """
+    Change-notification endpoint for the product spreadsheet.
+
+    Point a Drive files.watch channel or an Apps Script onEdit trigger
+    at this URL; it marks the products cache dirty so the next catalog
+    read refetches, letting the TTL stay long between edits. The marker
+    is written to the shared file-based cache, so it also reaches a bot
+    process running separately from this web server.
+    """
+    token = settings.SHEETS_WEBHOOK_TOKEN
+    if token and request.headers.get('X-Webhook-Token') != token:
+        return HttpResponseForbidden()
+    sheets_service.invalidate()
+    return HttpResponse('ok')